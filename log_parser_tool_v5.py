@@ -1,11 +1,29 @@
 # ✅ Log Parser Tool v5.0: Enhanced with Modular Design and Improved Parsing Logic
+import csv
+import heapq
+import io
+import math
 import os
+import pickle
+import queue
 import re
+import sys
+import tempfile
+import threading
 import tkinter as tk
-from tkinter import filedialog, messagebox, ttk
+from bisect import bisect_left, bisect_right
+from array import array
+from collections import Counter, deque
+from tkinter import filedialog, messagebox, simpledialog, ttk
 import pandas as pd
-from datetime import datetime
-from openpyxl import load_workbook
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from fnmatch import fnmatch
+from itertools import chain, islice
+from time import perf_counter
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, Border, Side
 from openpyxl.utils import get_column_letter
 
@@ -25,7 +43,7 @@ def denom_to_usd(denom):
 def to_12hr_format(time_str, tz_label="EST"):
     try:
         dt = datetime.strptime(time_str, "%H:%M:%S,%f")
-        formatted = dt.strftime("%I:%M:%S,%f %p")[:-3]  # keep 3-digit milliseconds
+        formatted = dt.strftime("%I:%M:%S,%f")[:-3] + dt.strftime(" %p")  # keep 3-digit milliseconds
         return f"{formatted} {tz_label}"
     except:
         return time_str
@@ -39,7 +57,100 @@ def format_duration(t1, t2):
     except:
         return ""
 
+# Timezone Logic
+TZ_ZONES = {
+    "EST": "America/New_York",
+    "CST": "America/Chicago",
+    "MST": "America/Denver",
+    "PST": "America/Los_Angeles",
+    "UTC": "UTC",
+}
+TZ_STEP_MINUTES = 15  # zone transitions fall on a quarter hour
+
+class TimezoneConverter:
+    """
+    Converts log timestamps from the zone the cabinet logged in to the zone of the report.
+    The offset between the two zones is worked out once per calendar day and cached as a short
+    list of segments, so a DST switch inside a day is honoured while every other row costs a
+    dict lookup. Labels are the target zone's abbreviation at that time (EST/EDT, ...).
+    During a fall-back hour, repeated local times are taken as their first occurrence.
+    Without a tz database (e.g. Windows without the tzdata package) times are left as logged and
+    labelled with the source zone; error then holds the reason, so callers can refuse a report
+    that asked for another zone.
+    """
+    def __init__(self, source_label, target_label=None):
+        target_label = target_label or source_label
+        self.target_label = target_label
+        self.days = {}
+        self.error = None
+        try:
+            self.source = ZoneInfo(TZ_ZONES.get(source_label, source_label))
+            self.target = ZoneInfo(TZ_ZONES.get(target_label, target_label))
+        except (ZoneInfoNotFoundError, ValueError) as e:
+            print(f"Timezone conversion skipped: {e}")
+            self.error = str(e)
+            self.target_label = source_label
+            self.source = self.target = None
+
+    def day_offsets(self, date_str):
+        """
+        Returns [(start "HH:MM", delta, label), ...] for one source-zone calendar day.
+        """
+        segments = self.days.get(date_str)
+        if segments is None:
+            segments = []
+            day = datetime.strptime(date_str, "%Y-%m-%d")
+            for step in range(0, 24 * 60, TZ_STEP_MINUTES):
+                local = day + timedelta(minutes=step)
+                converted = local.replace(tzinfo=self.source).astimezone(self.target)
+                delta = converted.replace(tzinfo=None) - local
+                label = converted.tzname()
+                if not segments or segments[-1][1:] != (delta, label):
+                    segments.append((local.strftime("%H:%M"), delta, label))
+            self.days[date_str] = segments
+        return segments
+
+    def convert(self, date_str, time_str):
+        """
+        Returns (date, time, label) for a log Date/Time pair in the target zone.
+        """
+        if self.source is None:
+            return date_str, time_str, self.target_label
+        try:
+            segments = self.day_offsets(date_str)
+        except ValueError:
+            return date_str, time_str, self.target_label
+        if len(segments) == 1:
+            _, delta, label = segments[0]
+        else:
+            idx = bisect_right([start for start, _, _ in segments], time_str[:5]) - 1
+            _, delta, label = segments[max(idx, 0)]
+        if not delta:
+            return date_str, time_str, label
+        dt = datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M:%S,%f") + delta
+        return dt.strftime("%Y-%m-%d"), dt.strftime("%H:%M:%S,%f")[:-3], label
+
 # Excel Formatting Enhancements
+RAPID_SPIN_FONT = Font(bold=True, color="FF0000")
+THIN_SIDE = Side(border_style="thin", color="000000")
+THICK_SIDE = Side(border_style="medium", color="000000")
+
+def is_rapid_spin(val):
+    if isinstance(val, str):
+        match = re.match(r"(\d+):(\d+):(\d+),(\d+)", val)
+        if match:
+            h, m, s, ms = map(int, match.groups())
+            return h * 3600000 + m * 60000 + s * 1000 + ms < 1000
+    return False
+
+def cell_border(row, col, max_row, max_column):
+    return Border(
+        left=THICK_SIDE if col == 1 else THIN_SIDE,
+        right=THICK_SIDE if col == max_column else THIN_SIDE,
+        top=THICK_SIDE if row == 1 else THIN_SIDE,
+        bottom=THICK_SIDE if row == max_row else THIN_SIDE
+    )
+
 def auto_adjust_column_widths(writer, sheet_name):
     ws = writer.sheets[sheet_name]
     for column_cells in ws.columns:
@@ -60,83 +171,998 @@ def format_excel(path):
                     max_length = max(max_length, len(str(cell.value)))
             ws.column_dimensions[column].width = max_length + 2
 
+        # max_row/max_column scan every cell in openpyxl, so read them once
+        max_row, max_column = ws.max_row, ws.max_column
+
         # Highlight Time Between Spins < 1 second
-        for row in range(2, ws.max_row + 1):
-            val = ws[f"M{row}"].value
-            if isinstance(val, str):
-                match = re.match(r"(\d+):(\d+):(\d+),(\d+)", val)
-                if match:
-                    h, m, s, ms = map(int, match.groups())
-                    total_ms = h * 3600000 + m * 60000 + s * 1000 + ms
-                    if total_ms < 1000:
-                        ws[f"M{row}"].font = Font(bold=True, color="FF0000")
+        headers = [cell.value for cell in ws[1]]
+        if "Time Between Spins" in headers:
+            column = get_column_letter(headers.index("Time Between Spins") + 1)
+            for row in range(2, max_row + 1):
+                if is_rapid_spin(ws[f"{column}{row}"].value):
+                    ws[f"{column}{row}"].font = RAPID_SPIN_FONT
 
         # Add borders to all cells
-        thin = Side(border_style="thin", color="000000")
-        thick = Side(border_style="medium", color="000000")
-        for row in ws.iter_rows(min_row=1, max_row=ws.max_row, min_col=1, max_col=ws.max_column):
+        for row in ws.iter_rows(min_row=1, max_row=max_row, min_col=1, max_col=max_column):
             for cell in row:
-                is_header = cell.row == 1
-                is_edge = cell.col_idx == 1 or cell.col_idx == ws.max_column or is_header or cell.row == ws.max_row
-                cell.border = Border(
-                    left=thick if cell.col_idx == 1 else thin,
-                    right=thick if cell.col_idx == ws.max_column else thin,
-                    top=thick if is_header else thin,
-                    bottom=thick if cell.row == ws.max_row else thin
-                )
+                cell.border = cell_border(cell.row, cell.col_idx, max_row, max_column)
 
         wb.save(path)
     except Exception as e:
         print(f"Excel formatting skipped: {e}")
 
+# Export Logic
+DEFAULT_MEMORY_BUDGET_MB = 1024
+# Raw rows carry every parsed key=value field for session extraction, but the raw CSV keeps the
+# log line's own fields.
+RAW_COLUMNS = ["Date", "Time", "MessageType", "MessageSender", "RawMessage"]
+SUMMARY_COLUMNS = [
+    "Date", "GameStart", "Title", "Denom", "# of Lines", "Bets Per Line",
+    "Starting Balance", "Bet Amount", "Win Amount", "Ending Balance",
+    "GameEnd", "Time Between Spins", "Length of Game", "Action Type"
+]
+
+def estimate_row_bytes(row):
+    return sys.getsizeof(row) + sum(sys.getsizeof(val) for val in row.values())
+
+class RowSpillBuffer:
+    """
+    List-like row store with a memory budget. Rows are kept in memory until their estimated size
+    reaches budget_bytes, then pickled to a temporary chunk file. Iterating replays the chunks
+    and then the in-memory tail, in the order the rows were appended.
+    """
+    def __init__(self, budget_bytes, spill_dir=None):
+        self.budget_bytes = budget_bytes
+        self.spill_dir = spill_dir
+        self.rows = []
+        self.used = 0
+        self.count = 0
+        self.chunks = []
+
+    def append(self, row):
+        self.rows.append(row)
+        self.count += 1
+        self.used += estimate_row_bytes(row)
+        if self.used >= self.budget_bytes:
+            self.spill()
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def spill(self):
+        fd, path = tempfile.mkstemp(prefix="logparser_", suffix=".spill", dir=self.spill_dir)
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(self.rows, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self.chunks.append(path)
+        self.rows = []
+        self.used = 0
+
+    @property
+    def spilled(self):
+        return bool(self.chunks)
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for path in self.chunks:
+            with open(path, 'rb') as f:
+                yield from pickle.load(f)
+        yield from self.rows
+
+    def close(self):
+        for path in self.chunks:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self.chunks = []
+        self.rows = []
+
+def new_row_buffers(memory_budget):
+    """
+    Returns (raw rows, summary rows) containers. Without a budget these are plain lists; with one,
+    each gets half of it and spills to disk past that. The budget covers these export rows only:
+    the session records kept while extracting (one per game, cashout or insert) and the chunks a
+    sharded parse has in flight are held in memory regardless.
+    """
+    if memory_budget is None:
+        return [], []
+    if memory_budget <= 0:
+        raise ValueError("memory budget must be positive")
+    return RowSpillBuffer(memory_budget // 2), RowSpillBuffer(memory_budget // 2)
+
+def close_row_buffers(*buffers):
+    for rows in buffers:
+        if isinstance(rows, RowSpillBuffer):
+            rows.close()
+
+def write_rows_csv(rows, columns, csv_path):
+    with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns, restval="", extrasaction='ignore', lineterminator=os.linesep)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def write_summary_xlsx(summary_rows, xlsx_path):
+    """
+    Streams the Game Summary sheet with openpyxl's write-only mode, applying the same widths,
+    borders and rapid-spin highlighting as format_excel without loading the workbook back.
+    """
+    widths = [len(col) for col in SUMMARY_COLUMNS]
+    row_count = 0
+    for row in summary_rows:
+        row_count += 1
+        for i, col in enumerate(SUMMARY_COLUMNS):
+            widths[i] = max(widths[i], len(str(row.get(col, ""))))
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Game Summary")
+    for i, width in enumerate(widths, 1):
+        ws.column_dimensions[get_column_letter(i)].width = width + 2
+
+    max_row, max_column = row_count + 1, len(SUMMARY_COLUMNS)
+    borders = {}
+    def styled(value, row_idx, col_idx, font=None):
+        cell = WriteOnlyCell(ws, value=value)
+        key = (row_idx == 1, row_idx == max_row, col_idx)
+        if key not in borders:
+            borders[key] = cell_border(row_idx, col_idx, max_row, max_column)
+        cell.border = borders[key]
+        if font is not None:
+            cell.font = font
+        return cell
+
+    ws.append([styled(col, 1, i) for i, col in enumerate(SUMMARY_COLUMNS, 1)])
+    for row_idx, row in enumerate(summary_rows, 2):
+        cells = []
+        for i, col in enumerate(SUMMARY_COLUMNS, 1):
+            value = row.get(col, "")
+            font = RAPID_SPIN_FONT if col == "Time Between Spins" and is_rapid_spin(value) else None
+            cells.append(styled(value if value != "" else None, row_idx, i, font))
+        ws.append(cells)
+    wb.save(xlsx_path)
+
 # Log Parsing Logic
-def parse_log_file(file_path, tz_label):
+LOG_LINE_RE = re.compile(r'(\d{4}-\d{2}-\d{2}) (\d{2}:\d{2}:\d{2},\d{3}) (\w+)\s+([^|]+)\|\s+(.*)')
+
+# Files smaller than this are never split; below it the process start-up costs more than it saves.
+SHARD_MIN_BYTES = 32 * 1024 * 1024
+
+def parse_line(line):
+    match = LOG_LINE_RE.match(line)
+    if not match:
+        return None
+    date, time, msg_type, sender, message = match.groups()
+    return {
+        'Date': date,
+        'Time': time,
+        'MessageType': msg_type,
+        'MessageSender': sender.strip(),
+        'RawMessage': message.strip()
+    }
+
+def extract_key_values(message):
+    data = {}
+    if ':' in message:
+        action, rest = message.split(':', 1)
+        data['ActionType'] = action.strip().rstrip(':')
+        parts = re.split(r'[; ]+', rest.strip())
+    else:
+        data['ActionType'] = message.strip()
+        parts = []
+    for part in parts:
+        if '=' in part:
+            key, val = part.split('=', 1)
+            data[key.strip()] = val.strip()
+    return data
+
+def combine_all_fields(line):
+    base = parse_line(line)
+    if not base:
+        return None
+    extracted = extract_key_values(base['RawMessage'])
+    base.update(extracted)
+    return base
+
+# Meters Index Logic
+METER_FIELDS = ["CurrentPlayableAmount", "CurrentRestrictedAmount", "TotalPlayerPoints"]
+METER_MISSING = -2 ** 63    # stored for a meter that is not a number, reported as blank
+
+def time_key(date, time):
+    """('YYYY-MM-DD', 'HH:MM:SS,mmm') as the integer YYYYMMDDHHMMSSmmm, which sorts in time order."""
+    return int(date.replace('-', '') + time.replace(':', '').replace(',', ''))
+
+def meter_value(val):
+    try:
+        return int(val)
+    except:
+        return METER_MISSING
+
+class MetersIndex:
+    """
+    The Meters summary readings of one log as parallel arrays sorted by position in the log.
+    The reading in force before or after an event, or at a point in time, is a binary search.
+    Times normally only grow along the log; if a reading is logged with an earlier time than the
+    one before it (a DST fall-back in a local-time log, a clock stepped back), lookups by time go
+    through a time-sorted order of the readings built on first use.
+    """
+    def __init__(self):
+        self.positions = array('Q')     # entry index (or line number) of each reading
+        self.times = array('Q')         # time_key of each reading
+        self.values = {field: array('q') for field in METER_FIELDS}
+        self.in_time_order = True
+        self.time_order = None          # (sorted times, reading index of each), if not in_time_order
+
+    def __len__(self):
+        return len(self.positions)
+
+    def add(self, position, entry):
+        key = time_key(entry["Date"], entry["Time"])
+        if self.times and key < self.times[-1]:
+            self.in_time_order = False
+        self.time_order = None
+        self.positions.append(position)
+        self.times.append(key)
+        for field in METER_FIELDS:
+            self.values[field].append(meter_value(entry.get(field, 0)))
+
+    def extend(self, other, offset=0):
+        """Appends the readings of a later part of the same log whose positions start at offset."""
+        if not other.in_time_order or (self.times and other.times and other.times[0] < self.times[-1]):
+            self.in_time_order = False
+        self.time_order = None
+        self.positions.extend(position + offset for position in other.positions)
+        self.times.extend(other.times)
+        for field in METER_FIELDS:
+            self.values[field].extend(other.values[field])
+
+    def last_at_or_before(self, key):
+        """Index of the reading with the latest time_key <= key (the last logged of equal times), or -1."""
+        if self.in_time_order:
+            return bisect_right(self.times, key) - 1
+        if self.time_order is None:
+            # A stable sort keeps readings with equal times in log order
+            order = sorted(range(len(self)), key=self.times.__getitem__)
+            self.time_order = (array('Q', (self.times[idx] for idx in order)), order)
+        times, order = self.time_order
+        idx = bisect_right(times, key)
+        return order[idx - 1] if idx else -1
+
+    def value(self, idx, field="CurrentPlayableAmount"):
+        val = self.values[field][idx]
+        return None if val == METER_MISSING else val
+
+    def before(self, position, field="CurrentPlayableAmount"):
+        """The last reading logged before position, or None."""
+        idx = bisect_left(self.positions, position)
+        return self.value(idx - 1, field) if idx else None
+
+    def after(self, position, field="CurrentPlayableAmount"):
+        """The first reading logged after position, or None."""
+        idx = bisect_right(self.positions, position)
+        return self.value(idx, field) if idx < len(self) else None
+
+    def at(self, when):
+        """
+        Returns the Meters summary in force at a time as {field: cents or points, "Time": reading time},
+        or None before the first reading. when is a datetime or 'YYYY-MM-DD HH:MM:SS[,mmm]' in the
+        log's own time zone; without milliseconds the whole second is included. Raises ValueError
+        if when is not such a time.
+        """
+        whole_second = False
+        if not isinstance(when, datetime):
+            try:
+                when = datetime.strptime(when.strip(), "%Y-%m-%d %H:%M:%S,%f")
+            except ValueError:
+                when = datetime.strptime(when.strip(), "%Y-%m-%d %H:%M:%S")
+                whole_second = True
+        millis = 999 if whole_second else when.microsecond // 1000
+        idx = self.last_at_or_before(int(when.strftime("%Y%m%d%H%M%S")) * 1000 + millis)
+        if idx < 0:
+            return None
+        reading = {field: self.value(idx, field) for field in METER_FIELDS}
+        key = str(self.times[idx])
+        reading["Time"] = f"{key[:4]}-{key[4:6]}-{key[6:8]} {key[8:10]}:{key[10:12]}:{key[12:14]},{key[14:]}"
+        return reading
+
+    def balance_at(self, when):
+        """CurrentPlayableAmount in cents at a time, or None."""
+        reading = self.at(when)
+        return reading["CurrentPlayableAmount"] if reading else None
+
+    @classmethod
+    def from_log(cls, file_path):
+        """Builds the index straight from a log file, parsing only the Meters summary lines."""
+        index = cls()
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for line_no, line in enumerate(f, 1):
+                if "Meters summary" in line:
+                    entry = combine_all_fields(line)
+                    if entry and entry.get("ActionType", "") == "Meters summary":
+                        index.add(line_no, entry)
+        return index
+
+# Session Extraction Logic
+# Sessions are extracted in one forward pass. The forward scans for accepted/rejected/complete events
+# are kept as pending state instead of re-reading the file, and the "nearest Meters summary" lookups
+# are resolved against the log's MetersIndex once every record's position is known. This lets a chunk
+# of a file be extracted on its own and stitched to its neighbours later.
+def _resolve_ticket(entry):
+    """
+    Returns (kind, (status, value, date, time)) if the entry settles an inserted ticket or note,
+    else (None, None).
+    """
+    action = entry.get("ActionType", "")
+    if "Ticket accepted" in action:
+        return "Voucher", ("Accepted", cents_to_usd(entry.get("value", 0)), entry["Date"], entry["Time"])
+    if "Ticket rejected" in action:
+        return "Voucher", ("Rejected", "", entry["Date"], entry["Time"])
+    if "Note accepted" in action:
+        return "Bill", ("Accepted", cents_to_usd(entry.get("valueCents", 0)), entry["Date"], entry["Time"])
+    if "Note rejected" in action:
+        return "Bill", ("Rejected", "", entry["Date"], entry["Time"])
+    return None, None
+
+def extract_chunk_sessions(entries):
+    """
+    Extracts game, cashout and bill/voucher records from a run of parsed entries, assuming no
+    game is open when the run starts. Anything that depends on entries outside the run is left
+    as None and resolved by stitch_chunk_sessions.
+    """
+    records = []
+    game = None
+    cashout_waits = []
+    ticket_waits = {"Voucher": [], "Bill": []}
+    chunk = {
+        "records": records,
+        "open_game": None,
+        "size": len(entries),
+        "meters": MetersIndex(),
+        "first_resolution": {"Voucher": None, "Bill": None},
+        # What a cashout still waiting when the chunk starts would see before its completion
+        "cashout_amt": None,
+        "cashout_val": None,
+        "cashout_end": None,
+        # The first sasEngine.gameEnd closes a game left open by the previous chunk
+        "first_game_end": None,
+        "end_of_game": None,
+    }
+
+    for idx, entry in enumerate(entries):
+        action = entry.get("ActionType", "")
+
+        # Forward scans: every entry is visible to them, including the ones inside games
+        if action == "Meters summary":
+            chunk["meters"].add(idx, entry)
+        elif action == "SAS TicketOut request":
+            amt = cents_to_usd(entry.get("amt", 0))
+            for rec in cashout_waits:
+                rec["amt"] = amt
+            if chunk["cashout_end"] is None:
+                chunk["cashout_amt"] = amt
+        elif action == "SAS TicketOut response - Success":
+            val = entry.get("validation", "")
+            for rec in cashout_waits:
+                rec["val"] = val
+            if chunk["cashout_end"] is None:
+                chunk["cashout_val"] = val
+        elif action == "Cashout complete.":
+            for rec in cashout_waits:
+                rec["end_date"], rec["end_time"] = entry["Date"], entry["Time"]
+            cashout_waits = []
+            if chunk["cashout_end"] is None:
+                chunk["cashout_end"] = (entry["Date"], entry["Time"])
+        else:
+            kind, resolution = _resolve_ticket(entry)
+            if kind:
+                for rec in ticket_waits[kind]:
+                    rec["resolution"] = resolution
+                ticket_waits[kind] = []
+                if chunk["first_resolution"][kind] is None:
+                    chunk["first_resolution"][kind] = resolution
+
+        if chunk["first_game_end"] is None:
+            if action == "End of game":
+                chunk["end_of_game"] = (entry.get("#lines", ""), entry.get("bet_per_line", ""))
+            elif action == "sasEngine.gameEnd":
+                chunk["first_game_end"] = {
+                    "index": idx,
+                    "date": entry["Date"],
+                    "time": entry["Time"],
+                    "wagered": entry.get("amountWagered", 0),
+                    "won": entry.get("amountWon", 0),
+                }
+
+        # Session state: nothing but the game's own end events is looked at while a game is open
+        if game is not None:
+            if action == "End of game":
+                game["lines"] = entry.get("#lines", "")
+                game["bpl"] = entry.get("bet_per_line", "")
+            elif action == "sasEngine.gameEnd":
+                game["end_anchor"] = idx
+                game["end_date"], game["end_time"] = entry["Date"], entry["Time"]
+                game["wagered"] = entry.get("amountWagered", 0)
+                game["won"] = entry.get("amountWon", 0)
+                records.append(game)
+                game = None
+        elif action == "--Beginning game":
+            game = {
+                "kind": "Game", "anchor": idx, "date": entry["Date"], "time": entry["Time"],
+                "title": entry.get("title", ""), "denom": entry.get("denom", ""),
+                "lines": "", "bpl": "",
+            }
+        elif action == "Cashout initiated.":
+            rec = {
+                "kind": "Cashout", "anchor": idx, "date": entry["Date"], "time": entry["Time"],
+                "amt": "", "val": "", "end_date": None, "end_time": None,
+            }
+            records.append(rec)
+            cashout_waits.append(rec)
+        elif action in ["Ticket inserted", "Note inserted"]:
+            kind = "Voucher" if "Ticket" in action else "Bill"
+            rec = {
+                "kind": kind, "anchor": idx, "date": entry["Date"], "time": entry["Time"],
+                "val_id": entry.get("validation#", ""), "resolution": None,
+            }
+            records.append(rec)
+            ticket_waits[kind].append(rec)
+
+    chunk["open_game"] = game
+    return chunk
+
+def _is_pending(rec):
+    if rec["kind"] == "Game":
+        return False
+    if rec["kind"] == "Cashout":
+        return rec["end_time"] is None
+    return rec["resolution"] is None
+
+def stitch_chunk_sessions(chunks, tz, summary_rows=None):
+    """
+    Merges per-chunk extraction results, in file order, into the summary rows the serial
+    extractor would have produced for the whole file.
+    """
+    records = []
+    meters = MetersIndex()
+    offset = 0
+    open_game = None
+    cashout_waits = []
+    ticket_waits = {"Voucher": [], "Bill": []}
+
+    for chunk in chunks:
+        meters.extend(chunk["meters"], offset)
+
+        # Settle records from earlier chunks whose forward scan runs into this chunk
+        for kind, waits in ticket_waits.items():
+            if chunk["first_resolution"][kind] is not None:
+                for rec in waits:
+                    rec["resolution"] = chunk["first_resolution"][kind]
+                ticket_waits[kind] = []
+        for rec in cashout_waits:
+            if chunk["cashout_amt"] is not None:
+                rec["amt"] = chunk["cashout_amt"]
+            if chunk["cashout_val"] is not None:
+                rec["val"] = chunk["cashout_val"]
+        if chunk["cashout_end"] is not None:
+            for rec in cashout_waits:
+                rec["end_date"], rec["end_time"] = chunk["cashout_end"]
+            cashout_waits = []
+
+        skip_before = 0
+        if open_game is not None:
+            if chunk["end_of_game"] is not None:
+                open_game["lines"], open_game["bpl"] = chunk["end_of_game"]
+            game_end = chunk["first_game_end"]
+            if game_end is None:
+                # The whole chunk falls inside a game that started earlier
+                offset += chunk["size"]
+                continue
+            open_game["end_anchor"] = offset + game_end["index"]
+            open_game["end_date"], open_game["end_time"] = game_end["date"], game_end["time"]
+            open_game["wagered"] = game_end["wagered"]
+            open_game["won"] = game_end["won"]
+            records.append(open_game)
+            open_game = None
+            skip_before = game_end["index"]
+
+        for rec in chunk["records"]:
+            if rec["anchor"] < skip_before:
+                continue
+            # Anchors become positions in the whole file
+            rec["anchor"] += offset
+            if "end_anchor" in rec:
+                rec["end_anchor"] += offset
+            records.append(rec)
+            if _is_pending(rec):
+                if rec["kind"] == "Cashout":
+                    cashout_waits.append(rec)
+                else:
+                    ticket_waits[rec["kind"]].append(rec)
+
+        open_game = chunk["open_game"]
+        if open_game is not None:
+            open_game["anchor"] += offset
+        offset += chunk["size"]
+
+    for rec in records:
+        rec["start_balance"] = meters.before(rec["anchor"])
+        if rec["kind"] == "Game":
+            rec["end_balance"] = meters.after(rec["end_anchor"])
+
+    return build_summary_rows(records, tz, summary_rows)
+
+def build_summary_rows(records, tz, summary_rows=None):
+    """
+    Turns extracted records into Game Summary rows, filling in Time Between Spins in order.
+    tz is a timezone label or a TimezoneConverter; dates and times are shown in its target zone.
+    Rows are appended to summary_rows if given, e.g. a RowSpillBuffer.
+    """
+    if not isinstance(tz, TimezoneConverter):
+        tz = TimezoneConverter(tz)
+    if summary_rows is None:
+        summary_rows = []
+    last_game_end = None
+    for rec in records:
+        start_bal = cents_to_usd(rec["start_balance"]) if rec["start_balance"] is not None else ""
+        date, start_time, label = tz.convert(rec["date"], rec["time"])
+        row = {
+            "Date": date, "Title": "", "Denom": "",
+            "# of Lines": "", "Bets Per Line": "",
+            "GameStart": to_12hr_format(start_time, label),
+            "Starting Balance": start_bal, "Bet Amount": "", "Win Amount": "",
+            "Ending Balance": "", "GameEnd": "",
+            "Length of Game": "", "Time Between Spins": "",
+            "Action Type": ""
+        }
+        if rec["kind"] == "Game":
+            row["Title"] = rec["title"]
+            row["Denom"] = denom_to_usd(rec["denom"])
+            row["# of Lines"] = rec["lines"]
+            row["Bets Per Line"] = rec["bpl"]
+            row["Bet Amount"] = cents_to_usd(rec["wagered"])
+            row["Win Amount"] = cents_to_usd(rec["won"])
+            if rec["end_balance"] is not None:
+                row["Ending Balance"] = cents_to_usd(rec["end_balance"])
+            row["GameEnd"] = to_12hr_format(*tz.convert(rec["end_date"], rec["end_time"])[1:])
+            try:
+                t1 = datetime.strptime(rec["time"], "%H:%M:%S,%f")
+                t2 = datetime.strptime(rec["end_time"], "%H:%M:%S,%f")
+                row["Length of Game"] = format_duration(t1, t2)
+                if last_game_end:
+                    row["Time Between Spins"] = format_duration(last_game_end, t1)
+                last_game_end = t2
+            except:
+                pass
+        elif rec["kind"] == "Cashout":
+            row["Ending Balance"] = "$0.00"
+            if rec["end_time"] is not None:
+                row["GameEnd"] = to_12hr_format(*tz.convert(rec["end_date"], rec["end_time"])[1:])
+                row["Action Type"] = f"{rec['amt']} Voucher Cashout, Val-ID: {rec['val']}"
+        else:
+            status, value, end_date, end = rec["resolution"] or ("", "", "", "")
+            action_type = f"{value} {rec['kind']} Inserted/{status}"
+            if rec["kind"] == "Voucher" and rec["val_id"]:
+                action_type += f", Val-ID: {rec['val_id']}"
+            row["GameEnd"] = to_12hr_format(*tz.convert(end_date, end)[1:]) if end else ""
+            row["Ending Balance"] = value if status == "Accepted" else start_bal
+            row["Action Type"] = action_type
+        summary_rows.append(row)
+    return summary_rows
+
+def extract_summary_rows(entries, tz, summary_rows=None):
+    return stitch_chunk_sessions([extract_chunk_sessions(entries)], tz, summary_rows)
+
+# Anomaly Detection Logic
+RAPID_SPIN_THRESHOLD = timedelta(seconds=1)
+REJECT_CASHOUT_WINDOW = timedelta(minutes=5)
+FINDINGS_COLUMNS = ["Source", "Line", "Date", "Time", "Rule", "Detail"]
+
+def entry_datetime(entry):
+    return datetime.strptime(f"{entry['Date']} {entry['Time']}", "%Y-%m-%d %H:%M:%S,%f")
+
+class AnomalyDetector:
+    """
+    Checks anomaly rules against parsed entries as they stream past, keeping O(1) state.
+    Every hit is appended to findings with the source file and line number it came from.
+    """
+    def __init__(self, spin_gap=RAPID_SPIN_THRESHOLD, reject_window=REJECT_CASHOUT_WINDOW):
+        self.spin_gap = spin_gap
+        self.reject_window = reject_window
+        self.findings = []
+        self.last_game_end = None
+        self.game_won = None        # End of game + End of freespin amtwon of the open game
+        self.last_meters = None
+        self.end_balance = None     # balance the last game ended on, cleared by credit changes
+        self.awaiting_end_balance = False
+        self.last_rejected = None   # (time, source, line) of the last rejected ticket
+
+    def add(self, entry, source, line_no, rule, detail):
+        self.findings.append({
+            "Source": os.path.basename(source), "Line": line_no,
+            "Date": entry["Date"], "Time": entry["Time"],
+            "Rule": rule, "Detail": detail
+        })
+
+    def feed(self, entry, source, line_no):
+        action = entry.get("ActionType", "")
+        if action == "--Beginning game":
+            start = entry_datetime(entry)
+            if self.last_game_end is not None and start - self.last_game_end < self.spin_gap:
+                gap = format_duration(self.last_game_end, start)
+                self.add(entry, source, line_no, "Rapid spin", f"Time Between Spins {gap}")
+            if self.end_balance is not None and self.last_meters != self.end_balance:
+                self.add(entry, source, line_no, "Balance discontinuity",
+                         f"Ending Balance {cents_to_usd(self.end_balance)}, "
+                         f"next Starting Balance {cents_to_usd(self.last_meters)}")
+            self.end_balance = None
+            self.game_won = 0
+        elif action in ["End of game", "End of freespin"]:
+            if self.game_won is not None:
+                try:
+                    self.game_won += int(entry.get("amtwon", 0))
+                except ValueError:
+                    pass
+        elif action == "sasEngine.gameEnd":
+            won = entry.get("amountWon", "")
+            if self.game_won is not None and won != str(self.game_won):
+                self.add(entry, source, line_no, "Win mismatch",
+                         f"amountWon={won}, End of game amtwon total={self.game_won}")
+            self.game_won = None
+            self.last_game_end = entry_datetime(entry)
+            self.awaiting_end_balance = True
+        elif action == "Meters summary":
+            self.last_meters = entry.get("CurrentPlayableAmount", 0)
+            if self.awaiting_end_balance:
+                self.end_balance = self.last_meters
+                self.awaiting_end_balance = False
+        elif action == "Ticket rejected":
+            self.last_rejected = (entry_datetime(entry), source, line_no)
+        elif action in ["Ticket accepted", "Note accepted"]:
+            # Money in moves the balance legitimately between games
+            self.end_balance = None
+            self.last_rejected = None
+        elif action == "Cashout initiated.":
+            if self.last_rejected is not None:
+                rejected_at, rejected_source, rejected_line = self.last_rejected
+                if entry_datetime(entry) - rejected_at <= self.reject_window:
+                    self.add(entry, source, line_no, "Cashout after rejected ticket",
+                             f"Ticket rejected at {os.path.basename(rejected_source)}:{rejected_line}")
+            self.last_rejected = None
+            self.end_balance = None
+
+def parse_log_file(file_path, tz, detector=None, memory_budget=None):
     """
     Parses a log file and extracts raw data and summarized game session data.
+    With a memory_budget (bytes), raw and summary rows past the budget are spilled to disk.
+    """
+    raw_rows, summary_rows = new_row_buffers(memory_budget)
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            collect_entries(((file_path, line_no, line) for line_no, line in enumerate(f, 1)), raw_rows, detector)
+
+        extract_summary_rows(raw_rows, tz, summary_rows)
+    except BaseException:
+        close_row_buffers(raw_rows, summary_rows)
+        raise
+    return raw_rows, summary_rows
+
+def collect_entries(numbered_lines, raw_rows, detector=None):
+    """Appends the parsed entry of each (path, line_no, line) to raw_rows and feeds it to the detector."""
+    for path, line_no, line in numbered_lines:
+        entry = combine_all_fields(line)
+        if entry:
+            raw_rows.append(entry)
+            if detector is not None:
+                detector.feed(entry, path, line_no)
+
+# Sharded Parsing Logic
+def find_chunk_boundaries(file_path, n_chunks):
+    """
+    Splits a file into at most n_chunks byte ranges that start and end on line boundaries.
+    Returns the list of offsets, including 0 and the file size.
+    """
+    size = os.path.getsize(file_path)
+    offsets = [0]
+    with open(file_path, 'rb') as f:
+        for k in range(1, n_chunks):
+            f.seek(max(size * k // n_chunks, offsets[-1]))
+            f.readline()
+            pos = f.tell()
+            if pos >= size:
+                break
+            if pos > offsets[-1]:
+                offsets.append(pos)
+    offsets.append(size)
+    return offsets
+
+def parse_log_chunk(file_path, start, end):
+    """
+    Worker for parse_log_file_sharded: parses one byte range and extracts its sessions.
+    """
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    entries, line_numbers = [], []
+    line_no = 0
+    with io.TextIOWrapper(io.BytesIO(data), encoding='utf-8') as text:
+        for line_no, line in enumerate(text, 1):
+            entry = combine_all_fields(line)
+            if entry:
+                entries.append(entry)
+                line_numbers.append(line_no)
+    return entries, line_numbers, line_no, extract_chunk_sessions(entries)
+
+def parse_log_file_sharded(file_path, tz, n_chunks=None, detector=None, memory_budget=None):
     """
+    Same output as parse_log_file, but a large file is split into chunks of about SHARD_MIN_BYTES
+    that are parsed and session-extracted on separate cores, then stitched back together in file
+    order. Only one chunk per worker is submitted ahead of the one being collected, so the parsed
+    entries held outside the row buffers stay bounded whatever the size of the file.
+    """
+    size = os.path.getsize(file_path)
+    if n_chunks is None:
+        n_chunks = size // SHARD_MIN_BYTES
+    workers = min(os.cpu_count() or 1, n_chunks)
+    offsets = find_chunk_boundaries(file_path, max(n_chunks, 1))
+    if len(offsets) <= 2 or workers < 2:
+        return parse_log_file(file_path, tz, detector, memory_budget)
+
+    raw_rows, summary_rows = new_row_buffers(memory_budget)
+    try:
+        chunks = []
+        first_line = 0
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            ranges = iter(zip(offsets[:-1], offsets[1:]))
+            pending = deque(pool.submit(parse_log_chunk, file_path, start, end)
+                            for start, end in islice(ranges, workers))
+            while pending:
+                entries, line_numbers, line_count, chunk = pending.popleft().result()
+                for start, end in islice(ranges, 1):
+                    pending.append(pool.submit(parse_log_chunk, file_path, start, end))
+                raw_rows.extend(entries)
+                chunks.append(chunk)
+                if detector is not None:
+                    # Anomaly rules carry state across chunk borders, so they run over the stitched stream
+                    for entry, line_no in zip(entries, line_numbers):
+                        detector.feed(entry, file_path, first_line + line_no)
+                first_line += line_count
+
+        stitch_chunk_sessions(chunks, tz, summary_rows)
+    except BaseException:
+        close_row_buffers(raw_rows, summary_rows)
+        raise
+    return raw_rows, summary_rows
+
+# Overlap Merge Logic
+TIMESTAMP_RE = re.compile(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}')
+
+def line_timestamp(line):
+    match = TIMESTAMP_RE.match(line)
+    return match.group(0) if match else None
+
+def first_timestamp(file_path):
     with open(file_path, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
+        for line in f:
+            ts = line_timestamp(line)
+            if ts:
+                return ts
+    return ""
 
-    raw_rows = []
-    summary_rows = []
+def iter_keyed_lines(path):
+    """
+    Yields (path, line number, line, timestamp, key) for a file. Lines without a timestamp take
+    the timestamp of the event line they follow and are keyed together with it; lines ahead of
+    the file's first timestamp get None for both.
+    """
+    event_ts, event_key = None, None
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            text = line.rstrip('\r\n')
+            own_ts = line_timestamp(line)
+            if own_ts:
+                event_ts, event_key = own_ts, hash(text)
+                key = event_key
+            elif event_ts is None:
+                yield path, line_no, line, None, None
+                continue
+            else:
+                key = hash((event_key, text))
+            yield path, line_no, line, event_ts, key
 
-    for line in lines:
-        match = re.match(r'(\d{4}-\d{2}-\d{2}) (\d{2}:\d{2}:\d{2},\d{3}) (\w+)\s+([^|]+)\|\s+(.*)', line)
-        if match:
-            date, time, msg_type, sender, message = match.groups()
-            base_data = {
-                'Date': date,
-                'Time': time,
-                'MessageType': msg_type,
-                'MessageSender': sender.strip(),
-                'RawMessage': message.strip()
-            }
-            raw_rows.append(base_data)
+def overlap_length(tail, head, head_is_whole_file):
+    """
+    Number of lines at the start of head that repeat the end of tail, in order and without a gap.
+    tail and head are lists of (timestamp, key). The match is aligned on the first position in tail
+    from which it holds line for line to the end of tail, or to the end of the file when the whole
+    file lies inside tail. A match is only trusted if tail runs on to a later timestamp than where
+    it starts: a file that merely continues the log starts at or after the end of tail, so within a
+    single millisecond (e.g. a Lamp bits dump) a repeat cannot be told apart from new lines and both
+    copies are kept.
+    """
+    if not head:
+        return 0
+    keys = [key for _, key in head]
+    tail_keys = [key for _, key in tail]
+    for start, key in enumerate(tail_keys):
+        if key != keys[0] or tail[start][0] >= tail[-1][0]:
+            continue
+        n = min(len(tail) - start, len(head))
+        if n < len(tail) - start and not head_is_whole_file:
+            continue
+        if tail_keys[start:start + n] == keys[:n]:
+            return n
+    return 0
+
+def iter_deduplicated_lines(paths, stats=None):
+    """
+    Yields (path, line number, line) for overlapping pulls of one cabinet log as a single stream,
+    ordered by each file's first timestamp. A file's opening lines are dropped only if they repeat,
+    line for line, the end of what the files before it produced. Only lines at or after the next
+    file's first timestamp are kept for the comparison, so memory follows the size of the overlap
+    rather than the size of the files. Lines without a timestamp are keyed together with the event
+    line they follow, and lines ahead of a file's first timestamp share the fate of its first event.
+    """
+    if stats is None:
+        stats = {}
+    stats["dropped"] = 0
+    starts = {path: first_timestamp(path) for path in paths}
+    ordered = sorted(paths, key=lambda path: (starts[path], path))
 
-            # Further processing for summary rows (to be implemented)
-            # Example: Process game sessions, cashouts, vouchers, etc.
+    window = deque()  # (timestamp, key) of the output tail the next file may repeat
+    for idx, path in enumerate(ordered):
+        next_start = starts[ordered[idx + 1]] if idx + 1 < len(ordered) else None
+        lines = iter_keyed_lines(path)
+        head, prefix = [], []
+        for item in lines:
+            if item[3] is None:
+                head.append(item)
+            else:
+                prefix.append(item)
+                break
+        # Read only as far as the window reaches, to compare the file's start against it
+        prefix.extend(islice(lines, max(len(window) - 1, 0)))
+        whole_file = len(prefix) < len(window)
+        overlap = overlap_length(list(window), [item[3:] for item in prefix], whole_file)
 
+        if overlap:
+            stats["dropped"] += len(head) + overlap
+            head = []
+        for item_path, line_no, line, ts, key in chain(head, prefix[overlap:], lines):
+            yield item_path, line_no, line
+            if next_start is not None and ts is not None and ts >= next_start:
+                window.append((ts, key))
+
+        while window and (next_start is None or window[0][0] < next_start):
+            window.popleft()
+
+def parse_merged_logs(paths, tz, detector=None, memory_budget=None):
+    """
+    Parses overlapping pulls of the same log as one deduplicated stream.
+    Returns raw rows, summary rows and the number of duplicate lines dropped.
+    """
+    stats = {}
+    raw_rows, summary_rows = new_row_buffers(memory_budget)
+    try:
+        collect_entries(iter_deduplicated_lines(paths, stats), raw_rows, detector)
+        extract_summary_rows(raw_rows, tz, summary_rows)
+    except BaseException:
+        close_row_buffers(raw_rows, summary_rows)
+        raise
+    return raw_rows, summary_rows, stats["dropped"]
+
+# Rotated Log Logic
+# Rotated pieces of one machine's log share a base name: "EGM01.txt", "EGM01.1.txt", "EGM01.txt.2".
+# Groups: base of "name.txt.N", base of "name.N.txt", base of "name.txt".
+ROTATED_LOG_RE = re.compile(r'(.+)\.txt\.\d+$|(.+?)\.\d+\.txt$|(.+)\.txt$')
+NUMBERED_TAIL_RE = re.compile(r'\.\d+$')
+
+def group_rotated_logs(file_names):
+    """
+    Groups log file names by machine, i.e. by the name with its rotation number removed.
+    "name.N.txt" only counts as a rotation if name has no ".N" tail of its own, so dated names
+    like "EGM01.2025.05.05.txt" stay whole, and a rotation only joins a machine another file
+    also belongs to, so a lone "bank.12.txt" is machine "bank.12".
+    Returns {machine base name: [file names]} in first-seen order.
+    """
+    machines = {}
+    for name in file_names:
+        match = ROTATED_LOG_RE.match(name)
+        if not match:
+            continue
+        own = name[:-len(".txt")] if name.endswith(".txt") else name
+        base = match.group(1) or match.group(2) or match.group(3)
+        if match.group(2) and NUMBERED_TAIL_RE.search(base):
+            base = own
+        machines[name] = (base, own)
+    shared = Counter(base for base, _ in machines.values())
+    groups = {}
+    for name, (base, own) in machines.items():
+        groups.setdefault(base if shared[base] > 1 else own, []).append(name)
+    return groups
+
+def iter_log_events(path):
+    """
+    Yields (timestamp, path, [(line number, line), ...]) per event line of a file, with the
+    lines that follow it without a timestamp kept in the same group. Lines ahead of the
+    first timestamp travel with the first event.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        ts, lines = None, []
+        for line_no, line in enumerate(f, 1):
+            own_ts = line_timestamp(line)
+            if own_ts:
+                if ts is not None:
+                    yield ts, path, lines
+                    lines = []
+                ts = own_ts
+            lines.append((line_no, line))
+        if lines:
+            yield ts or "", path, lines
+
+def iter_rotated_lines(paths):
+    """
+    Yields (path, line number, line) for the rotated files of one machine as a single stream
+    in timestamp order. Each file is read lazily and merged through a heap, so only one
+    pending event per file is held in memory. Events with equal timestamps keep the order
+    of the files' first timestamps, then the file order.
+    """
+    ordered = sorted(paths, key=lambda path: (first_timestamp(path), path))
+    events = heapq.merge(*(iter_log_events(path) for path in ordered), key=lambda event: event[0])
+    for _, path, lines in events:
+        for line_no, line in lines:
+            yield path, line_no, line
+
+def parse_rotated_logs(paths, tz, detector=None, memory_budget=None):
+    """
+    Parses the rotated files of one machine as one continuous log, so games and spin gaps
+    that cross a rotation are extracted as if the log had never been split.
+    """
+    raw_rows, summary_rows = new_row_buffers(memory_budget)
+    try:
+        collect_entries(iter_rotated_lines(paths), raw_rows, detector)
+        extract_summary_rows(raw_rows, tz, summary_rows)
+    except BaseException:
+        close_row_buffers(raw_rows, summary_rows)
+        raise
     return raw_rows, summary_rows
 
-def save_to_files(raw_rows, summary_rows, folder_selected, base):
+def save_to_files(raw_rows, summary_rows, folder_selected, base, findings=None, timeline=None):
     """
-    Saves raw and summarized data to CSV and Excel files.
+    Saves raw and summarized data to CSV and Excel files, plus anomaly findings and the hardware
+    output timeline if given.
+    Rows that were spilled to disk are streamed out chunk by chunk instead of via DataFrames.
     """
-    df_raw = pd.DataFrame(raw_rows)
-    summary_columns = [
-        "Date", "GameStart", "Title", "Denom", "# of Lines", "Bets Per Line",
-        "Starting Balance", "Bet Amount", "Win Amount", "Ending Balance",
-        "GameEnd", "Time Between Spins", "Length of Game", "Action Type"
-    ]
+    raw_csv = os.path.join(folder_selected, f"{base}_Raw Extraction.csv")
+    summary_csv = os.path.join(folder_selected, f"{base}_GameSummary.csv")
+    summary_xlsx = os.path.join(folder_selected, f"{base}_GameSummary.xlsx")
+
+    buffers = [rows for rows in (raw_rows, summary_rows) if isinstance(rows, RowSpillBuffer)]
+    if any(rows.spilled for rows in buffers):
+        try:
+            write_rows_csv(raw_rows, RAW_COLUMNS, raw_csv)
+            write_rows_csv(summary_rows, SUMMARY_COLUMNS, summary_csv)
+            write_summary_xlsx(summary_rows, summary_xlsx)
+        finally:
+            close_row_buffers(*buffers)
+    else:
+        save_dataframes(list(raw_rows), list(summary_rows), raw_csv, summary_csv, summary_xlsx)
+
+    if findings is not None:
+        findings_csv = os.path.join(folder_selected, f"{base}_Findings.csv")
+        pd.DataFrame(findings, columns=FINDINGS_COLUMNS).to_csv(findings_csv, index=False)
+
+    if timeline is not None and timeline.times:
+        timeline.save(os.path.join(folder_selected, f"{base}_Outputs.csv"))
+
+def save_dataframes(raw_rows, summary_rows, raw_csv, summary_csv, summary_xlsx):
+    df_raw = pd.DataFrame(raw_rows, columns=RAW_COLUMNS)
     df_summary = pd.DataFrame(summary_rows)
-    for col in summary_columns:
+    for col in SUMMARY_COLUMNS:
         if col not in df_summary.columns:
             df_summary[col] = ""
-    df_summary = df_summary.reindex(columns=summary_columns)
+    df_summary = df_summary.reindex(columns=SUMMARY_COLUMNS)
 
-    raw_csv = os.path.join(folder_selected, f"{base}_Raw Extraction.csv")
-    summary_csv = os.path.join(folder_selected, f"{base}_GameSummary.csv")
-    summary_xlsx = os.path.join(folder_selected, f"{base}_GameSummary.xlsx")
     df_raw.to_csv(raw_csv, index=False)
     df_summary.to_csv(summary_csv, index=False)
 
@@ -145,33 +1171,954 @@ def save_to_files(raw_rows, summary_rows, folder_selected, base):
         auto_adjust_column_widths(writer, "Game Summary")
     format_excel(summary_xlsx)
 
+# Pipeline Logic
+# Files are read, parsed and exported by three threads joined by bounded queues, so reading file
+# N+1, parsing file N and exporting file N-1 overlap while read-ahead stays capped.
+PIPELINE_BLOCK_BYTES = 1024 * 1024
+PIPELINE_QUEUE_BLOCKS = 8   # blocks of lines read ahead of the parser
+PIPELINE_QUEUE_FILES = 2    # parsed files waiting for export
+PIPELINE_DONE = None
+
+class StageMetrics:
+    """Time a pipeline stage spends working, starved for input and blocked on a full output queue."""
+    def __init__(self, name, out_queue=None):
+        self.name = name
+        self.out_queue = out_queue
+        self.items = 0
+        self.busy = 0.0
+        self.waiting_input = 0.0
+        self.blocked_output = 0.0
+        self.max_depth = 0
+
+    def get(self, in_queue, stop):
+        """Next item of in_queue, or PIPELINE_DONE once the pipeline is stopped."""
+        started = perf_counter()
+        item = PIPELINE_DONE
+        while not stop.is_set():
+            try:
+                item = in_queue.get(timeout=0.1)
+                break
+            except queue.Empty:
+                pass
+        self.waiting_input += perf_counter() - started
+        return item
+
+    def put(self, item, stop):
+        """Queues item; returns False if the pipeline was stopped first and item was not queued."""
+        started = perf_counter()
+        queued = False
+        while not stop.is_set():
+            try:
+                self.out_queue.put(item, timeout=0.1)
+                queued = True
+                break
+            except queue.Full:
+                pass
+        self.blocked_output += perf_counter() - started
+        self.max_depth = max(self.max_depth, self.out_queue.qsize())
+        return queued
+
+    def summary(self):
+        text = (f"{self.name}: {self.items} items, busy {self.busy:.1f}s, "
+                f"waiting for input {self.waiting_input:.1f}s, blocked on output {self.blocked_output:.1f}s")
+        if self.out_queue is not None:
+            text += f", max queue {self.max_depth}/{self.out_queue.maxsize}"
+        return text
+
+def read_stage(paths, metrics, stop):
+    """Reads each file in blocks of lines; (path, None) marks the end of a file."""
+    for path in paths:
+        if stop.is_set():
+            return
+        with open(path, 'r', encoding='utf-8') as f:
+            while not stop.is_set():
+                started = perf_counter()
+                lines = f.readlines(PIPELINE_BLOCK_BYTES)
+                metrics.busy += perf_counter() - started
+                if not lines:
+                    break
+                metrics.items += 1
+                metrics.put((path, lines), stop)
+        metrics.put((path, None), stop)
+    metrics.put(PIPELINE_DONE, stop)
+
+def parse_stage(in_queue, tz, memory_budget, metrics, stop):
+    """
+    Parses blocks as they arrive and hands each finished file on with its summary, findings and timeline.
+    Up to PIPELINE_QUEUE_FILES + 2 files hold rows at once (queued, exporting, being parsed and one
+    waiting to be queued), so each gets that share of memory_budget.
+    """
+    if memory_budget is not None:
+        memory_budget = max(1, memory_budget // (PIPELINE_QUEUE_FILES + 2))
+    raw_rows = summary_rows = detector = None
+    line_no = 0
+    try:
+        while True:
+            item = metrics.get(in_queue, stop)
+            if item is PIPELINE_DONE:
+                break
+            started = perf_counter()
+            path, lines = item
+            if raw_rows is None:
+                raw_rows, summary_rows = new_row_buffers(memory_budget)
+                detector = AnomalyDetector()
+                line_no = 0
+            if lines is not None:
+                collect_entries(((path, line_no + i, line) for i, line in enumerate(lines, 1)), raw_rows, detector)
+                line_no += len(lines)
+                metrics.busy += perf_counter() - started
+                continue
+            extract_summary_rows(raw_rows, tz, summary_rows)
+            parsed = (path, raw_rows, summary_rows, detector.findings, build_output_timeline(raw_rows))
+            metrics.items += 1
+            metrics.busy += perf_counter() - started
+            if not metrics.put(parsed, stop):
+                break
+            raw_rows = None
+    finally:
+        if raw_rows is not None:
+            # Stopped part-way through a file, or before its rows could be handed on
+            close_row_buffers(raw_rows, summary_rows)
+    metrics.put(PIPELINE_DONE, stop)
+
+def run_pipeline(paths, folder_selected, tz, memory_budget=None, exported=None):
+    """
+    Parses and exports paths like the serial per-file loop, with reading, parsing and exporting
+    overlapped. Exports run on the calling thread, into folder_selected or, if that is None, next
+    to each log; exported(path) is called after each. Returns the StageMetrics of the three stages.
+    """
+    blocks = queue.Queue(maxsize=PIPELINE_QUEUE_BLOCKS)
+    parsed = queue.Queue(maxsize=PIPELINE_QUEUE_FILES)
+    stop = threading.Event()
+    errors = []
+    read_metrics = StageMetrics("Read", blocks)
+    parse_metrics = StageMetrics("Parse", parsed)
+    write_metrics = StageMetrics("Export")
+
+    def guarded(stage, *args):
+        try:
+            stage(*args)
+        except BaseException as e:
+            errors.append(e)
+            stop.set()
+
+    threads = [
+        threading.Thread(target=guarded, args=(read_stage, paths, read_metrics, stop), daemon=True),
+        threading.Thread(target=guarded, args=(parse_stage, blocks, tz, memory_budget, parse_metrics, stop),
+                         daemon=True),
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        while True:
+            item = write_metrics.get(parsed, stop)
+            if item is PIPELINE_DONE:
+                break
+            started = perf_counter()
+            path, raw_rows, summary_rows, findings, timeline = item
+            base = os.path.splitext(os.path.basename(path))[0]
+            try:
+                save_to_files(raw_rows, summary_rows, folder_selected or os.path.dirname(path), base,
+                              findings, timeline)
+            finally:
+                close_row_buffers(raw_rows, summary_rows)
+            if exported is not None:
+                exported(path)
+            write_metrics.items += 1
+            write_metrics.busy += perf_counter() - started
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+        while not parsed.empty():
+            item = parsed.get()
+            if item is not PIPELINE_DONE:
+                close_row_buffers(item[1], item[2])
+    if errors:
+        raise errors[0]
+    return [read_metrics, parse_metrics, write_metrics]
+
+# Discovery Logic
+MANIFEST_NAME = "log_manifest.csv"
+MANIFEST_COLUMNS = ["Path", "Size", "MTime", "Processed"]
+DEFAULT_INCLUDE = "*.txt"
+
+def parse_patterns(text):
+    """Comma-separated glob patterns from a text field."""
+    return [pattern.strip() for pattern in text.split(",") if pattern.strip()]
+
+def matches_any(rel_path, name, patterns):
+    return any(fnmatch(rel_path, pattern) or fnmatch(name, pattern) for pattern in patterns)
+
+def scan_logs(folder, include=(DEFAULT_INCLUDE,), exclude=()):
+    """
+    Walks folder recursively with os.scandir and yields (relative path, size, mtime in ns) for files
+    that match an include pattern and no exclude pattern. Patterns are globs matched against the
+    name and against the '/'-separated path relative to folder; excluded directories are not entered.
+    Only directory entries are read, no file is opened.
+    """
+    pending = [("", folder)]
+    while pending:
+        rel_dir, path = pending.pop()
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    rel_path = rel_dir + entry.name
+                    if matches_any(rel_path, entry.name, exclude):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append((rel_path + "/", entry.path))
+                    elif entry.is_file() and matches_any(rel_path, entry.name, include):
+                        stat = entry.stat()
+                        yield rel_path, stat.st_size, stat.st_mtime_ns
+        except OSError as e:
+            print(f"Scan of {path} skipped: {e}")
+
+def scan_machine_logs(folder, include=(DEFAULT_INCLUDE,), exclude=()):
+    """
+    Yields (machine, paths) for the logs scan_logs finds under folder, with the rotated files of a
+    machine grouped as by group_rotated_logs. A "name.txt.N" rotation is included whenever
+    "name.txt" would be. machine is the base name relative to folder.
+    """
+    include = list(include) + [pattern + ".[0-9]*" for pattern in include]
+    names = {}
+    for rel_path, _, _ in scan_logs(folder, include, exclude):
+        rel_dir, _, name = rel_path.rpartition("/")
+        names.setdefault(rel_dir, []).append(name)
+    for rel_dir in sorted(names):
+        for base, files in group_rotated_logs(sorted(names[rel_dir])).items():
+            machine = os.path.normpath(os.path.join(rel_dir, base))
+            yield machine, [os.path.join(folder, rel_dir, file) for file in files]
+
+def load_manifest(folder):
+    manifest = {}
+    manifest_path = os.path.join(folder, MANIFEST_NAME)
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r', newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                manifest[row["Path"]] = row
+    return manifest
+
+def save_manifest(folder, manifest):
+    """Writes the manifest to a temporary file first, so an interrupted save keeps the old one."""
+    fd, tmp_path = tempfile.mkstemp(prefix="log_manifest_", suffix=".tmp", dir=folder)
+    with os.fdopen(fd, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=MANIFEST_COLUMNS)
+        writer.writeheader()
+        for rel_path in sorted(manifest):
+            writer.writerow(manifest[rel_path])
+    os.replace(tmp_path, os.path.join(folder, MANIFEST_NAME))
+
+def update_manifest(folder, include=(DEFAULT_INCLUDE,), exclude=()):
+    """
+    Rescans folder against its manifest. Returns the updated manifest and the sorted relative paths
+    of logs that are new, changed in size or mtime, or not yet processed. Files that disappeared
+    are dropped from the manifest.
+    """
+    previous = load_manifest(folder)
+    manifest, changed = {}, []
+    for rel_path, size, mtime in scan_logs(folder, include, exclude):
+        row = previous.get(rel_path)
+        if row is None or row["Size"] != str(size) or row["MTime"] != str(mtime):
+            row = {"Path": rel_path, "Size": str(size), "MTime": str(mtime), "Processed": ""}
+        manifest[rel_path] = row
+        if not row["Processed"]:
+            changed.append(rel_path)
+    return manifest, sorted(changed)
+
+# Ticket Reconciliation Logic
+RECONCILIATION_COLUMNS = [
+    "Validation", "Status", "Amount", "Issued Source", "Issued Date", "Issued Time",
+    "Redeemed Source", "Redeemed Date", "Redeemed Time", "Detail"
+]
+
+def normalize_validation(val):
+    """Validation numbers are printed with dashes/leading zeros on some devices; compare digits only."""
+    digits = re.sub(r'\D', '', val)
+    if not digits:
+        return val.strip()
+    return digits.lstrip('0') or '0'
+
+class TicketReconciler:
+    """
+    Hash-joins tickets printed anywhere in the fleet against tickets inserted anywhere in the fleet.
+    Issued and redeemed tickets are kept in dicts keyed by validation number, so feeding events
+    and building the report are both linear in the number of ticket events.
+    """
+    def __init__(self):
+        self.issued = {}        # validation -> issue details
+        self.redemptions = {}   # validation -> [redemption details]
+        self.last_amount = {}   # machine -> amount of its last TicketOut request
+        self.inserted = {}      # machine -> redemptions waiting for accepted/rejected
+
+    def feed(self, entry, machine, source, line_no):
+        """
+        Feeds one entry of machine's log, read from line line_no of source. Each machine's
+        entries must be fed in time order, across its rotated files.
+        """
+        action = entry.get("ActionType", "")
+        if action == "SAS TicketOut request":
+            self.last_amount[machine] = cents_to_usd(entry.get("amt", 0))
+        elif action == "SAS TicketOut response - Success":
+            val = entry.get("validation", "")
+            self.issued[normalize_validation(val)] = {
+                "Validation": val, "Amount": self.last_amount.pop(machine, ""),
+                "Issued Source": f"{source}:{line_no}", "Issued Date": entry["Date"], "Issued Time": entry["Time"],
+            }
+        elif action == "Ticket inserted":
+            val = entry.get("validation#", "")
+            redemption = {
+                "Validation": val, "Status": "", "Amount": "", "Reason": "",
+                "Redeemed Source": f"{source}:{line_no}",
+                "Redeemed Date": entry["Date"], "Redeemed Time": entry["Time"],
+            }
+            self.redemptions.setdefault(normalize_validation(val), []).append(redemption)
+            self.inserted.setdefault(machine, []).append(redemption)
+        elif action in ["Ticket accepted", "Ticket rejected"]:
+            for redemption in self.inserted.pop(machine, []):
+                if action == "Ticket accepted":
+                    redemption["Status"] = "Accepted"
+                    redemption["Amount"] = cents_to_usd(entry.get("value", 0))
+                else:
+                    redemption["Status"] = "Rejected"
+                    redemption["Reason"] = entry.get("reason", "")
+
+    def report(self):
+        """
+        Returns unredeemed, double-redeemed, rejected and unresolved (inserted, but neither accepted
+        nor rejected in these logs) tickets as rows of RECONCILIATION_COLUMNS.
+        """
+        rows = []
+        keys = list(self.issued) + [key for key in self.redemptions if key not in self.issued]
+        for key in keys:
+            issue = self.issued.get(key)
+            redemptions = self.redemptions.get(key, [])
+            accepted = [r for r in redemptions if r["Status"] == "Accepted"]
+            notes = [] if issue else ["not issued in these logs"]
+            if issue and not accepted:
+                rows.append(dict(issue, Status="Unredeemed"))
+            for r in redemptions:
+                if len(accepted) > 1 and r["Status"] == "Accepted":
+                    detail = [f"accepted {len(accepted)} times"]
+                elif r["Status"] == "Rejected":
+                    detail = [f"reason={r['Reason']}"] + (["accepted on another insert"] if accepted else [])
+                elif r["Status"] == "":
+                    detail = ["no accept or reject logged"] + (["accepted on another insert"] if accepted else [])
+                else:
+                    continue
+                row = dict(issue or {"Validation": r["Validation"], "Amount": r["Amount"]})
+                row.update({col: r[col] for col in ["Redeemed Source", "Redeemed Date", "Redeemed Time"]})
+                row["Status"] = {"Accepted": "Double-redeemed", "Rejected": "Rejected"}.get(r["Status"], "Unresolved")
+                row["Detail"] = "; ".join(detail + notes)
+                rows.append(row)
+        return [{col: row.get(col, "") for col in RECONCILIATION_COLUMNS} for row in rows]
+
+def reconcile_tickets(folder, include=(DEFAULT_INCLUDE,), exclude=()):
+    """
+    Reconciles every log scan_machine_logs finds under folder in one pass over each file. Rotated
+    files of a machine are merged in timestamp order, so an insert and its accept can sit in
+    different files. Only lines that mention a ticket are parsed.
+    """
+    reconciler = TicketReconciler()
+    for machine, paths in scan_machine_logs(folder, include, exclude):
+        for path, line_no, line in iter_rotated_lines(paths):
+            if "Ticket" not in line:
+                continue
+            entry = combine_all_fields(line)
+            if entry:
+                reconciler.feed(entry, machine, os.path.relpath(path, folder), line_no)
+    return reconciler.report()
+
+# Latency Logic
+# (pair name, start ActionType, end ActionType, field that ties an end to its start, ActionType that
+# abandons the start, longest latency in ms that still counts as a match). Pairs without a key field
+# match an end to the most recent start, so their limit keeps an unrelated later event from being
+# taken for the answer; a start whose end comes later than that counts as unmatched.
+LATENCY_PAIRS = [
+    ("Finite deal outcome", "Waiting for finite deal outcome.", "Finite deal outcome received.", None, None, 10000),
+    ("Flash call", "Call to Flash", "Call from Flash", None, None, 500),
+    ("Ticket print", "Queueing print job", "Finished printing ticket", "job", None, 60000),
+    ("Game", "sasEngine.gameStart", "sasEngine.gameEnd", "gameSessionId", None, None),
+    ("Ticket redemption", "Ticket inserted", "Ticket accepted", None, "Ticket rejected", 30000),
+]
+LATENCY_SUB_BUCKETS = 16    # buckets per doubling, so percentiles are within ~4.5%
+LATENCY_BUCKETS = 32 * LATENCY_SUB_BUCKETS  # 1 ms up to ~50 days
+MAX_PENDING_STARTS = 1000   # per machine and pair; older unanswered starts count as unmatched
+LATENCY_COLUMNS = ["Machine", "Pair", "Count", "Unmatched", "p50 (ms)", "p95 (ms)", "p99 (ms)", "Max (ms)"]
+
+class LatencyHistogram:
+    """
+    Fixed-size log-scale histogram of latencies in milliseconds. Memory does not grow with the
+    number of samples, and histograms of different machines can be merged by adding buckets.
+    """
+    def __init__(self):
+        self.counts = array('Q', bytes(8 * (LATENCY_BUCKETS + 1)))
+        self.count = 0
+        self.max = 0.0
+
+    def add(self, ms):
+        idx = 0 if ms < 1 else min(int(math.log2(ms) * LATENCY_SUB_BUCKETS) + 1, LATENCY_BUCKETS)
+        self.counts[idx] += 1
+        self.count += 1
+        self.max = max(self.max, ms)
+
+    def merge(self, other):
+        for idx, n in enumerate(other.counts):
+            self.counts[idx] += n
+        self.count += other.count
+        self.max = max(self.max, other.max)
+
+    def percentile(self, pct):
+        """Upper edge of the bucket holding the pct-th percentile, capped at the largest sample."""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(self.count * pct / 100))
+        seen = 0
+        for idx, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(2 ** (idx / LATENCY_SUB_BUCKETS), self.max)
+
+class LatencyEngine:
+    """
+    Matches start/end event pairs per machine in one streaming pass and records their latency
+    in a LatencyHistogram per machine and pair.
+    """
+    def __init__(self, pairs=LATENCY_PAIRS):
+        self.pairs = pairs
+        self.markers = [marker for pair in pairs for marker in (pair[1], pair[2], pair[4]) if marker]
+        self.histograms = {}    # (machine, pair name) -> LatencyHistogram
+        self.pending = {}       # (machine, pair name) -> {key: start time}
+        self.unmatched = Counter()
+
+    def wants(self, line):
+        """Cheap check so lines that cannot start or end a pair are never parsed."""
+        return any(marker in line for marker in self.markers)
+
+    def feed(self, entry, machine):
+        action = entry.get("ActionType", "")
+        for name, start, end, key_field, abandon, max_ms in self.pairs:
+            slot = (machine, name)
+            key = entry.get(key_field, "") if key_field else ""
+            if action.startswith(start):
+                pending = self.pending.setdefault(slot, {})
+                if key in pending:
+                    self.unmatched[slot] += 1
+                    del pending[key]
+                elif len(pending) >= MAX_PENDING_STARTS:
+                    self.unmatched[slot] += 1
+                    del pending[next(iter(pending))]
+                pending[key] = entry_datetime(entry)
+            elif action.startswith(end) or (abandon and action.startswith(abandon)):
+                started = self.pending.get(slot, {}).pop(key, None)
+                if started is None:
+                    continue
+                ms = (entry_datetime(entry) - started) / timedelta(milliseconds=1)
+                if action.startswith(end) and (max_ms is None or ms <= max_ms):
+                    self.histograms.setdefault(slot, LatencyHistogram()).add(ms)
+                else:
+                    self.unmatched[slot] += 1
+
+    def report(self):
+        """Returns rows of LATENCY_COLUMNS per machine and pair, plus an "All machines" row per pair."""
+        slots = sorted(set(self.histograms) | set(self.unmatched) | set(self.pending))
+        totals = {}
+        rows = []
+        for machine, name in slots:
+            slot = (machine, name)
+            hist = self.histograms.get(slot, LatencyHistogram())
+            unmatched = self.unmatched[slot] + len(self.pending.get(slot, {}))
+            total_hist, total_unmatched = totals.get(name, (LatencyHistogram(), 0))
+            total_hist.merge(hist)
+            totals[name] = (total_hist, total_unmatched + unmatched)
+            rows.append(latency_row(machine, name, hist, unmatched))
+        for name, *_ in self.pairs:
+            if name in totals:
+                rows.append(latency_row("All machines", name, *totals[name]))
+        return rows
+
+def latency_row(machine, name, hist, unmatched):
+    row = [machine, name, hist.count, unmatched]
+    for value in (hist.percentile(50), hist.percentile(95), hist.percentile(99), hist.max if hist.count else None):
+        row.append("" if value is None else round(value))
+    return dict(zip(LATENCY_COLUMNS, row))
+
+def latency_report(folder, pairs=LATENCY_PAIRS, include=(DEFAULT_INCLUDE,), exclude=()):
+    """
+    Streams every log scan_machine_logs finds under folder once and reports pair latencies per
+    machine. Rotated files of a machine are merged in timestamp order so pairs that span a rotation match.
+    """
+    engine = LatencyEngine(pairs)
+    for machine, paths in scan_machine_logs(folder, include, exclude):
+        for _, _, line in iter_rotated_lines(paths):
+            if engine.wants(line):
+                entry = combine_all_fields(line)
+                if entry:
+                    engine.feed(entry, machine)
+    return engine.report()
+
+# Hardware Output Timeline Logic
+PIN_CHANGE_RE = re.compile(r'EFCO - Changing pin \(#: (\d+)[^)]*\):(\S+) Value: (True|False)')
+OUTPUT_PORT_RE = re.compile(r'EFCO - WriteOutputPort: (\d+) p_iByeValue: (\d+)')
+TIMELINE_COLUMNS = ["Channel", "Date", "Time", "Value"]
+LAMP_BITS_CHANNEL = "EFCO lamp bits port {}"   # a Lamp bits dump shows the port written just before it
+
+def timeline_key(ts):
+    """Timeline timestamps are the log's own 'YYYY-MM-DD HH:MM:SS,mmm' strings, which sort in time order."""
+    if isinstance(ts, datetime):
+        return ts.strftime("%Y-%m-%d %H:%M:%S,%f")[:-3]
+    return ts
+
+def format_bits(value, width):
+    """Bitset as a string of 0/1, bit 0 first, as the EFCO Lamp bits dump lists them."""
+    return "".join("1" if value >> i & 1 else "0" for i in range(width))
+
+class OutputTimeline:
+    """
+    Run-length encoded state of hardware outputs, EFCO pins, output ports and the lamp bit bank.
+    Every channel holds a bitset (one bit for a single output) and keeps only the times it changed,
+    so repeated writes of the same state cost nothing and a point-in-time lookup is a bisect.
+    """
+    def __init__(self):
+        self.times = {}     # channel -> start timestamp of each run
+        self.values = {}    # channel -> bitset of each run
+        self.widths = {}    # channel -> number of bits
+        self.lamp_bits = None   # bits of a Lamp bits dump still being read
+        self.lamp_ts = None
+        self.lamp_port = None
+        self.last_port = None   # port of the last WriteOutputPort
+
+    def set(self, channel, ts, value, width=1):
+        values = self.values.setdefault(channel, [])
+        self.widths[channel] = max(self.widths.get(channel, 0), width)
+        if values and values[-1] == value:
+            return
+        self.times.setdefault(channel, []).append(ts)
+        values.append(value)
+
+    def flush_lamp_bits(self):
+        if self.lamp_bits is not None:
+            value = sum(1 << i for i, bit in enumerate(self.lamp_bits) if bit == "1")
+            self.set(LAMP_BITS_CHANNEL.format(self.lamp_port), self.lamp_ts, value, len(self.lamp_bits))
+            self.lamp_bits = None
+
+    def feed(self, entry):
+        action = entry.get("ActionType", "")
+        if self.lamp_bits is not None:
+            # A Lamp bits dump is one 0/1 line per lamp, closed by "-- END"
+            if action in ["0", "1"]:
+                self.lamp_bits.append(action)
+                return
+            self.flush_lamp_bits()
+            if action == "-- END":
+                return
+
+        ts = f"{entry['Date']} {entry['Time']}"
+        if action == "Hardware output set":
+            channel = entry.get("logicalSwitch") or f"pin {entry.get('pin', '')}"
+            self.set(channel, ts, int(entry.get("value") == "True"))
+        elif action == "EFCO - Lamp bits":
+            self.lamp_bits, self.lamp_ts, self.lamp_port = [], ts, self.last_port
+        elif action.startswith("EFCO"):
+            message = entry["RawMessage"]
+            match = PIN_CHANGE_RE.match(message)
+            if match:
+                pin, name, value = match.groups()
+                self.set(f"EFCO pin {pin} {name}", ts, int(value == "True"))
+                return
+            match = OUTPUT_PORT_RE.match(message)
+            if match:
+                port, value = match.groups()
+                self.last_port = port
+                self.set(f"EFCO port {port}", ts, int(value), 8)
+
+    def state(self, channel, ts):
+        """Bitset of channel at ts, or None if it had not been written yet."""
+        times = self.times.get(channel, [])
+        idx = bisect_right(times, timeline_key(ts))
+        return self.values[channel][idx - 1] if idx else None
+
+    def bit(self, channel, n, ts):
+        """State of bit n of channel at ts as True/False, or None if it had not been written yet."""
+        value = self.state(channel, ts)
+        return None if value is None else bool(value >> n & 1)
+
+    def transitions(self, start, end, channels=None):
+        """Returns (timestamp, channel, old bitset, new bitset) for every change between start and end."""
+        start, end = timeline_key(start), timeline_key(end)
+        found = []
+        for channel in channels or list(self.times):
+            times, values = self.times.get(channel, []), self.values.get(channel, [])
+            for idx in range(bisect_left(times, start), bisect_right(times, end)):
+                found.append((times[idx], channel, values[idx - 1] if idx else None, values[idx]))
+        found.sort(key=lambda change: change[0])
+        return found
+
+    def save(self, csv_path):
+        with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(TIMELINE_COLUMNS)
+            for channel, times in self.times.items():
+                width = self.widths[channel]
+                for ts, value in zip(times, self.values[channel]):
+                    date, time = ts.split(" ")
+                    writer.writerow([channel, date, time, format_bits(value, width)])
+
+    @classmethod
+    def load(cls, csv_path):
+        timeline = cls()
+        with open(csv_path, 'r', newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                bits = row["Value"]
+                value = sum(1 << i for i, bit in enumerate(bits) if bit == "1")
+                timeline.set(row["Channel"], f"{row['Date']} {row['Time']}", value, len(bits))
+        return timeline
+
+def build_output_timeline(entries):
+    timeline = OutputTimeline()
+    for entry in entries:
+        timeline.feed(entry)
+    timeline.flush_lamp_bits()
+    return timeline
+
 # GUI Logic
 def browse_folder():
     folder_selected = filedialog.askdirectory()
     if not folder_selected:
         return
 
-    tz_label = timezone_combo.get()
-    messagebox.showinfo("Selected Timezone", f"Parsing logs with timezone: {tz_label}")
+    tz = TimezoneConverter(timezone_combo.get(), report_timezone_combo.get())
+    if tz.error and timezone_combo.get() != report_timezone_combo.get():
+        messagebox.showerror("Timezone conversion unavailable",
+                             f"Cannot report {timezone_combo.get()} logs in {report_timezone_combo.get()}: "
+                             f"{tz.error}\nInstall the tzdata package (pip install tzdata), or report in "
+                             f"the log timezone.")
+        return
+    try:
+        memory_budget = int(float(memory_budget_var.get()) * 1024 * 1024)
+    except (ValueError, OverflowError):
+        memory_budget = 0
+    if memory_budget <= 0:
+        messagebox.showerror("Invalid memory budget", "Memory budget must be a positive number of MB.")
+        return
+    messagebox.showinfo("Selected Timezone", f"Parsing {timezone_combo.get()} logs, "
+                                             f"reporting in {report_timezone_combo.get()}")
+
+    mode = mode_var.get()
+    txt_files = [file for file in os.listdir(folder_selected) if file.endswith(".txt")]
+    if mode == "merge":
+        paths = [os.path.join(folder_selected, file) for file in txt_files]
+        base = os.path.basename(os.path.normpath(folder_selected)) + "_Merged"
+        detector = AnomalyDetector()
+        raw_rows, summary_rows, dropped = parse_merged_logs(paths, tz, detector, memory_budget)
+        try:
+            timeline = build_output_timeline(raw_rows)
+            save_to_files(raw_rows, summary_rows, folder_selected, base, detector.findings, timeline)
+        finally:
+            close_row_buffers(raw_rows, summary_rows)
+        messagebox.showinfo("Done", f"Merged {len(paths)} logs, dropped {dropped} duplicate lines. "
+                                    f"Files saved to: {folder_selected}")
+        return
+
+    if mode == "rotated":
+        groups = group_rotated_logs(sorted(os.listdir(folder_selected)))
+        for base, files in groups.items():
+            paths = [os.path.join(folder_selected, file) for file in files]
+            detector = AnomalyDetector()
+            raw_rows, summary_rows = parse_rotated_logs(paths, tz, detector, memory_budget)
+            try:
+                timeline = build_output_timeline(raw_rows)
+                save_to_files(raw_rows, summary_rows, folder_selected, base, detector.findings, timeline)
+            finally:
+                close_row_buffers(raw_rows, summary_rows)
+        messagebox.showinfo("Done", f"Joined rotated logs into {len(groups)} machine logs. "
+                                    f"Files saved to: {folder_selected}")
+        return
 
-    for file in os.listdir(folder_selected):
-        if file.endswith(".txt"):
-            path = os.path.join(folder_selected, file)
-            base = os.path.splitext(file)[0]
+    if mode == "scan":
+        include = parse_patterns(include_var.get()) or [DEFAULT_INCLUDE]
+        exclude = parse_patterns(exclude_var.get())
+        manifest, changed = update_manifest(folder_selected, include, exclude)
+        rel_paths = {os.path.join(folder_selected, rel_path): rel_path for rel_path in changed}
 
-            raw_rows, summary_rows = parse_log_file(path, tz_label)
-            save_to_files(raw_rows, summary_rows, folder_selected, base)
+        def exported(path):
+            manifest[rel_paths[path]]["Processed"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        try:
+            metrics = run_pipeline(list(rel_paths), None, tz, memory_budget, exported)
+        finally:
+            save_manifest(folder_selected, manifest)
+        stages = "\n".join(stage.summary() for stage in metrics)
+        messagebox.showinfo("Done", f"Found {len(manifest)} logs, processed {len(changed)} new or changed. "
+                                    f"Files saved next to each log.\n\n{stages}")
+        return
+
+    if mode == "pipeline":
+        paths = [os.path.join(folder_selected, file) for file in txt_files]
+        metrics = run_pipeline(paths, folder_selected, tz, memory_budget)
+        stages = "\n".join(stage.summary() for stage in metrics)
+        messagebox.showinfo("Done", f"Log parsing complete. Files saved to: {folder_selected}\n\n{stages}")
+        return
+
+    for file in txt_files:
+        path = os.path.join(folder_selected, file)
+        base = os.path.splitext(file)[0]
+
+        detector = AnomalyDetector()
+        raw_rows, summary_rows = parse_log_file_sharded(path, tz, detector=detector,
+                                                        memory_budget=memory_budget)
+        try:
+            timeline = build_output_timeline(raw_rows)
+            save_to_files(raw_rows, summary_rows, folder_selected, base, detector.findings, timeline)
+        finally:
+            close_row_buffers(raw_rows, summary_rows)
 
     messagebox.showinfo("Done", f"Log parsing complete. Files saved to: {folder_selected}")
 
+def reconcile_folder():
+    folder_selected = filedialog.askdirectory()
+    if not folder_selected:
+        return
+    rows = reconcile_tickets(folder_selected, parse_patterns(include_var.get()) or [DEFAULT_INCLUDE],
+                             parse_patterns(exclude_var.get()))
+    report_csv = os.path.join(folder_selected, "Ticket_Reconciliation.csv")
+    pd.DataFrame(rows, columns=RECONCILIATION_COLUMNS).to_csv(report_csv, index=False)
+    counts = Counter(row["Status"] for row in rows)
+    messagebox.showinfo("Done", f"Unredeemed: {counts['Unredeemed']}, "
+                                f"double-redeemed: {counts['Double-redeemed']}, "
+                                f"rejected: {counts['Rejected']}, unresolved: {counts['Unresolved']}. "
+                                f"Report saved to: {report_csv}")
+
+def latency_folder():
+    folder_selected = filedialog.askdirectory()
+    if not folder_selected:
+        return
+    rows = latency_report(folder_selected, include=parse_patterns(include_var.get()) or [DEFAULT_INCLUDE],
+                          exclude=parse_patterns(exclude_var.get()))
+    report_csv = os.path.join(folder_selected, "Latency_Report.csv")
+    pd.DataFrame(rows, columns=LATENCY_COLUMNS).to_csv(report_csv, index=False)
+    messagebox.showinfo("Done", f"Latency report saved to: {report_csv}")
+
+def balance_at_time():
+    log_path = filedialog.askopenfilename(filetypes=[("Log files", "*.txt")])
+    if not log_path:
+        return
+    when = simpledialog.askstring("Balance at Time", "Log date and time (YYYY-MM-DD HH:MM:SS[,mmm]):")
+    if not when:
+        return
+    try:
+        reading = MetersIndex.from_log(log_path).at(when)
+    except ValueError:
+        messagebox.showerror("Invalid time", "Enter the time as YYYY-MM-DD HH:MM:SS[,mmm].")
+        return
+    if reading is None:
+        messagebox.showinfo("Balance at Time", f"No Meters summary logged before {when}.")
+        return
+    messagebox.showinfo("Balance at Time",
+                        f"CurrentPlayableAmount: {cents_to_usd(reading['CurrentPlayableAmount'])}\n"
+                        f"CurrentRestrictedAmount: {cents_to_usd(reading['CurrentRestrictedAmount'])}\n"
+                        f"TotalPlayerPoints: {reading['TotalPlayerPoints']}\n"
+                        f"From the Meters summary at {reading['Time']}")
+
+# Result Viewer Logic
+VIEWER_PAGE_SIZE = 30
+DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}$')
+TWELVE_HR_RE = re.compile(r'(\d{2}):(\d{2}):(\d{2}),(\d+)(?: (AM|PM))?')
+
+def parse_csv_line(line):
+    return next(csv.reader([line.decode('utf-8')]))
+
+def viewer_sort_key(value):
+    if not value:
+        return (2, "")
+    try:
+        return (0, float(value.lstrip("$")))
+    except ValueError:
+        pass
+    match = TWELVE_HR_RE.match(value)
+    if match:
+        h, m, sec, ms, half = match.groups()
+        hour = int(h) % 12 + (12 if half == "PM" else 0) if half else int(h)
+        return (1, f"{hour:02}:{m}:{sec},{ms}")
+    return (1, value)
+
+def query_csv_rows(csv_path, title="", date_from="", date_to="", action="", sort_column=None, descending=False):
+    """
+    Streams a result CSV once and returns its header and the byte offsets of the rows that pass
+    the filters, in display order. Only the offsets, plus the sort column while sorting, are held
+    in memory. Filters on columns the file does not have are ignored.
+    """
+    with open(csv_path, 'rb') as f:
+        header_line = f.readline()
+        header = parse_csv_line(header_line)
+        col = {name: i for i, name in enumerate(header)}
+        title_idx, date_idx, action_idx = col.get("Title"), col.get("Date"), col.get("Action Type")
+        sort_idx = col.get(sort_column)
+        title, action = title.lower(), action.lower()
+
+        offsets = array('Q')
+        keys = []
+        pos = len(header_line)
+        for line in f:
+            row_pos = pos
+            pos += len(line)
+            if not line.strip():
+                continue
+            if title or date_from or date_to or action or sort_idx is not None:
+                row = parse_csv_line(line)
+                row += [""] * (len(header) - len(row))
+                if title and title_idx is not None and title not in row[title_idx].lower():
+                    continue
+                if date_idx is not None:
+                    if date_from and row[date_idx] < date_from:
+                        continue
+                    if date_to and row[date_idx] > date_to:
+                        continue
+                if action and action_idx is not None and action not in row[action_idx].lower():
+                    continue
+                if sort_idx is not None:
+                    keys.append((viewer_sort_key(row[sort_idx]), row_pos))
+                    continue
+            offsets.append(row_pos)
+
+    if sort_idx is not None:
+        keys.sort(key=lambda item: item[0], reverse=descending)
+        offsets = array('Q', (row_pos for _, row_pos in keys))
+    return header, offsets
+
+def read_csv_rows(csv_path, offsets):
+    rows = []
+    with open(csv_path, 'rb') as f:
+        for row_pos in offsets:
+            f.seek(row_pos)
+            rows.append(parse_csv_line(f.readline()))
+    return rows
+
+class ResultViewer:
+    """
+    Paged window over a result CSV. The Treeview only ever holds one page of rows; the scrollbar
+    and mouse wheel move the page through the row offsets found by query_csv_rows.
+    """
+    def __init__(self, master, csv_path):
+        self.csv_path = csv_path
+        self.header, self.offsets = query_csv_rows(csv_path)
+        self.first = 0
+        self.sort_column, self.descending = None, False
+
+        self.window = tk.Toplevel(master)
+        self.window.title(f"Results - {os.path.basename(csv_path)}")
+        self.window.geometry("1200x720")
+
+        filters = tk.Frame(self.window)
+        filters.pack(fill="x", padx=5, pady=5)
+        self.title_var, self.date_from_var, self.date_to_var, self.action_var = (tk.StringVar() for _ in range(4))
+        for label, var, width in [("Title:", self.title_var, 15), ("From (YYYY-MM-DD):", self.date_from_var, 12),
+                                  ("To:", self.date_to_var, 12), ("Action Type:", self.action_var, 25)]:
+            tk.Label(filters, text=label).pack(side="left")
+            tk.Entry(filters, textvariable=var, width=width).pack(side="left", padx=(2, 8))
+        tk.Button(filters, text="Apply", command=self.query).pack(side="left")
+        self.count_label = tk.Label(filters)
+        self.count_label.pack(side="right")
+
+        body = tk.Frame(self.window)
+        body.pack(fill="both", expand=True)
+        self.tree = ttk.Treeview(body, columns=self.header, show="headings", height=VIEWER_PAGE_SIZE)
+        for name in self.header:
+            self.tree.heading(name, text=name, command=lambda c=name: self.sort_by(c))
+            self.tree.column(name, width=110, stretch=True)
+        self.scrollbar = ttk.Scrollbar(body, orient="vertical", command=self.on_scroll)
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll_to(self.first - 3 * int(e.delta / 120)))
+        self.tree.bind("<Button-4>", lambda e: self.scroll_to(self.first - 3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll_to(self.first + 3))
+        self.show_page()
+
+    def show_page(self):
+        self.tree.delete(*self.tree.get_children())
+        page = self.offsets[self.first:self.first + VIEWER_PAGE_SIZE]
+        for row in read_csv_rows(self.csv_path, page):
+            self.tree.insert("", "end", values=row)
+        total = len(self.offsets)
+        if total:
+            self.scrollbar.set(self.first / total, min(self.first + VIEWER_PAGE_SIZE, total) / total)
+        else:
+            self.scrollbar.set(0, 1)
+        self.count_label.config(text=f"{total:,} rows")
+
+    def scroll_to(self, first):
+        first = max(0, min(first, len(self.offsets) - VIEWER_PAGE_SIZE))
+        if first != self.first:
+            self.first = first
+            self.show_page()
+
+    def on_scroll(self, *args):
+        if args[0] == "moveto":
+            self.scroll_to(int(float(args[1]) * len(self.offsets)))
+        elif args[0] == "scroll":
+            step = VIEWER_PAGE_SIZE if args[2] == "pages" else 1
+            self.scroll_to(self.first + int(args[1]) * step)
+
+    def query(self):
+        for value in (self.date_from_var.get().strip(), self.date_to_var.get().strip()):
+            if value and not DATE_RE.match(value):
+                messagebox.showerror("Invalid date", f"Dates must be YYYY-MM-DD, got: {value}", parent=self.window)
+                return
+        _, self.offsets = query_csv_rows(
+            self.csv_path, self.title_var.get().strip(), self.date_from_var.get().strip(),
+            self.date_to_var.get().strip(), self.action_var.get().strip(), self.sort_column, self.descending)
+        self.first = 0
+        self.show_page()
+
+    def sort_by(self, column):
+        self.descending = not self.descending if column == self.sort_column else False
+        self.sort_column = column
+        self.query()
+
+def open_result_viewer():
+    csv_path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")])
+    if csv_path:
+        ResultViewer(root, csv_path)
+
 # GUI Initialization
-root = tk.Tk()
-root.title("Log Parser Tool v5.0")
-root.geometry("450x250")
-tk.Label(root, text="Select a folder containing log .txt files:", pady=10).pack()
-tk.Button(root, text="Browse Folder", command=browse_folder, height=2, width=20).pack(pady=10)
-tk.Label(root, text="Select log timezone:").pack()
-timezone_combo = ttk.Combobox(root, values=["EST", "CST", "MST", "PST", "UTC"], state="readonly")
-timezone_combo.current(0)
-timezone_combo.pack(pady=5)
-root.mainloop()
+if __name__ == "__main__":
+    root = tk.Tk()
+    root.title("Log Parser Tool v5.0")
+    root.geometry("450x700")
+    tk.Label(root, text="Select a folder containing log .txt files:", pady=10).pack()
+    tk.Button(root, text="Browse Folder", command=browse_folder, height=2, width=20).pack(pady=10)
+    tk.Label(root, text="Select log timezone:").pack()
+    timezone_combo = ttk.Combobox(root, values=list(TZ_ZONES), state="readonly")
+    timezone_combo.current(0)
+    timezone_combo.pack(pady=5)
+    tk.Label(root, text="Report timezone:").pack()
+    report_timezone_combo = ttk.Combobox(root, values=list(TZ_ZONES), state="readonly")
+    report_timezone_combo.current(0)
+    report_timezone_combo.pack(pady=5)
+    mode_frame = tk.LabelFrame(root, text="Mode")
+    mode_frame.pack(pady=5)
+    mode_var = tk.StringVar(value="pipeline")
+    for value, label in [("pipeline", "Parse each log"),
+                         ("shard", "Split large files across CPU cores"),
+                         ("merge", "Merge overlapping pulls into one summary"),
+                         ("rotated", "Join rotated logs per machine"),
+                         ("scan", "Scan subfolders, only new or changed logs")]:
+        tk.Radiobutton(mode_frame, text=label, variable=mode_var, value=value).pack(anchor="w")
+    pattern_frame = tk.Frame(root)
+    pattern_frame.pack(pady=5)
+    tk.Label(pattern_frame, text="Include:").pack(side="left")
+    include_var = tk.StringVar(value=DEFAULT_INCLUDE)
+    tk.Entry(pattern_frame, textvariable=include_var, width=14).pack(side="left")
+    tk.Label(pattern_frame, text="Exclude:").pack(side="left")
+    exclude_var = tk.StringVar(value="")
+    tk.Entry(pattern_frame, textvariable=exclude_var, width=14).pack(side="left")
+    budget_frame = tk.Frame(root)
+    budget_frame.pack(pady=5)
+    tk.Label(budget_frame, text="Memory budget for output rows (MB):").pack(side="left")
+    memory_budget_var = tk.StringVar(value=str(DEFAULT_MEMORY_BUDGET_MB))
+    tk.Entry(budget_frame, textvariable=memory_budget_var, width=8).pack(side="left")
+    tk.Button(root, text="Open Result Viewer", command=open_result_viewer, width=20).pack(pady=5)
+    tk.Button(root, text="Reconcile Tickets", command=reconcile_folder, width=20).pack(pady=5)
+    tk.Button(root, text="Latency Report", command=latency_folder, width=20).pack(pady=5)
+    tk.Button(root, text="Balance at Time", command=balance_at_time, width=20).pack(pady=5)
+    root.mainloop()
@@ -0,0 +1,108 @@
+import os
+import random
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+import log_parser_tool_v5 as tool
+
+EXAMPLE_LOG = os.path.join(ROOT, "ExampleLog.txt")
+
+EVENTS = [
+    "INFO  APP.gf [Plt] | --Beginning game: title=T{r}; mathmodel=m; denom={d}; wagerCents=500",
+    "INFO  APP    [Plt] | End of game: amtwon={w}; mpWon=0; reels=1 2 3; #lines=25; bet_per_line={b}; denom=10",
+    "INFO  SAS    [Plt] | sasEngine.gameEnd: amountWagered={a}; amountWon={w}; gameSessionId=1",
+    "INFO  METERS [Plt] | Meters summary: CurrentPlayableAmount={m}; CurrentRestrictedAmount=0; TotalPlayerPoints=0",
+    "INFO  APP    [Plt] | Cashout initiated.",
+    "INFO  SAS    [Plt] | SAS TicketOut request: amt={m}",
+    "INFO  SAS    [Plt] | SAS TicketOut response - Success: validation=V{r}",
+    "INFO  APP    [Plt] | Cashout complete.",
+    "INFO  DEV.bv [BV ] | Ticket inserted: validation#=00{r}",
+    "INFO  DEV.bv [BV ] | Ticket accepted: validation#=1; value={m}; code=X",
+    "INFO  DEV.bv [BV ] | Ticket rejected: reason=X",
+    "INFO  DEV.bv [BV ] | Note inserted",
+    "INFO  DEV.bv [BV ] | Note accepted: valueCents={m}; currency=USD",
+    "INFO  DEV.bv [BV ] | Note rejected",
+    None,   # a line without a timestamp
+]
+
+def write_random_log(path, n, seed):
+    """A log of n random game, cashout, ticket and note events with non-decreasing timestamps."""
+    rnd = random.Random(seed)
+    t = 10 * 3600 * 1000
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        for _ in range(n):
+            t += rnd.randint(0, 3000)
+            event = rnd.choice(EVENTS)
+            newline = rnd.choice(["\n", "\r\n"])
+            if event is None:
+                f.write("garbage line without timestamp" + newline)
+                continue
+            event = event.format(r=rnd.randint(0, 99), d=rnd.choice([5, 10, "x"]), w=rnd.randint(0, 900),
+                                 b=rnd.randint(1, 5), a=rnd.randint(1, 900), m=rnd.randint(0, 99999))
+            day, ms = divmod(t, 24 * 3600 * 1000)
+            stamp = f"2025-05-{5 + day:02} {ms // 3600000:02}:{ms // 60000 % 60:02}:{ms // 1000 % 60:02},{ms % 1000:03}"
+            f.write(f"{stamp} {event}{newline}")
+
+def summary_tuples(rows):
+    return [tuple(row.get(col, "") for col in tool.SUMMARY_COLUMNS) for row in rows]
+
+def stitched_summary(path, n_chunks):
+    offsets = tool.find_chunk_boundaries(path, n_chunks)
+    chunks = [tool.parse_log_chunk(path, start, end)[3] for start, end in zip(offsets[:-1], offsets[1:])]
+    return tool.stitch_chunk_sessions(chunks, "UTC")
+
+# Sharded parsing
+@pytest.mark.parametrize("n_chunks", [1, 2, 3, 5, 8, 13, 21, 34, 55])
+def test_stitched_chunks_match_serial_on_example_log(n_chunks):
+    _, serial = tool.parse_log_file(EXAMPLE_LOG, "UTC")
+    assert summary_tuples(stitched_summary(EXAMPLE_LOG, n_chunks)) == summary_tuples(serial)
+
+@pytest.mark.parametrize("seed", range(40))
+def test_stitched_chunks_match_serial_on_random_logs(tmp_path, seed):
+    path = str(tmp_path / "random.txt")
+    write_random_log(path, 300, seed)
+    _, serial = tool.parse_log_file(path, "UTC")
+    for n_chunks in [2, 3, 5, 8, 40, 150]:
+        assert summary_tuples(stitched_summary(path, n_chunks)) == summary_tuples(serial), n_chunks
+
+def test_sharded_parse_matches_serial_with_spilled_rows(tmp_path, monkeypatch):
+    path = str(tmp_path / "random.txt")
+    write_random_log(path, 5000, 1)
+    monkeypatch.setattr(tool.os, "cpu_count", lambda: 4)
+    raw_rows, summary_rows = tool.parse_log_file_sharded(path, "EST", n_chunks=4, memory_budget=300_000)
+    try:
+        assert raw_rows.spilled
+        serial_raw, serial_summary = tool.parse_log_file(path, "EST")
+        assert list(raw_rows) == serial_raw
+        assert list(summary_rows) == serial_summary
+    finally:
+        tool.close_row_buffers(raw_rows, summary_rows)
+
+# Overlap merge
+def test_merged_pulls_keep_every_line_once(tmp_path):
+    with open(EXAMPLE_LOG, 'r', newline='', encoding='utf-8') as f:
+        lines = f.readlines()
+    first, second = str(tmp_path / "pull1.txt"), str(tmp_path / "pull2.txt")
+    for seed in range(500):
+        rnd = random.Random(seed)
+        start = rnd.randrange(0, len(lines) - 400)
+        n1, n2 = rnd.randint(5, 200), rnd.randint(5, 200)
+        overlap = rnd.choice([0, rnd.randint(1, min(150, n1))])
+        pull1 = lines[start:start + n1]
+        pull2 = lines[start + n1 - overlap:start + n1 - overlap + n2]
+        with open(first, 'w', newline='', encoding='utf-8') as f:
+            f.writelines(pull1)
+        with open(second, 'w', newline='', encoding='utf-8') as f:
+            f.writelines(pull2)
+
+        merged = [line for _, _, line in tool.iter_deduplicated_lines([first, second])]
+        expected = lines[start:max(start + n1, start + n1 - overlap + n2)]
+        shared = lines[start + n1 - overlap:min(start + n1, start + n1 - overlap + n2)]
+        if len({tool.line_timestamp(line) for line in shared if tool.line_timestamp(line)}) > 1:
+            assert merged == expected, seed
+        else:
+            # An overlap within a single timestamp cannot be told from a genuine repeat, so it is kept
+            assert merged in (expected, pull1 + pull2), seed